@@ -21,6 +21,7 @@ from ffpuppet import SanitizerOptions
 LOG = logging.getLogger(__name__)
 
 ERROR_CODE = 77
+IS_WINDOWS = platform.system() == "Windows"
 
 
 class BaseParser(argparse.ArgumentParser):
@@ -33,7 +34,7 @@ class BaseParser(argparse.ArgumentParser):
             "--timeout",
             default=120,
             dest="timeout",
-            type=int,
+            type=float,
             help="Set the timeout. Defaults to '%(default)s' seconds.",
         )
         self.add_argument("cmd_with_flags", nargs=argparse.REMAINDER)
@@ -118,7 +119,7 @@ def _get_signal_name(signum: int, default: str = "Unknown signal") -> str:
     Returns:
         String description of the signal.
     """
-    if sys.version_info[:2] >= (3, 8) and platform.system() != "Windows":
+    if not IS_WINDOWS:
         return signal.strsignal(signum) or default
     for member in dir(signal):
         if member.startswith("SIG") and not member.startswith("SIG_"):
@@ -129,7 +130,7 @@ def _get_signal_name(signum: int, default: str = "Unknown signal") -> str:
 
 def timed_run(
     cmd_with_args: list[str],
-    timeout: int,
+    timeout: float,
     log_prefix: str | None = None,
     env: dict[str, str] | None = None,
     inp: str = "",
@@ -8,7 +8,9 @@ import abc
 import argparse
 import functools
 import hashlib
+import itertools
 import logging
+import math
 import re
 import time
 from collections.abc import Iterable, Iterator
@@ -1653,13 +1655,154 @@ class CollapseEmptyBraces(Minimize):
         # Don't update the testcase if no changes were applied
         if raw != modified:
             assert iterator.testcase.filename is not None
-            with open(iterator.testcase.filename, "wb") as testf:
-                testf.write(iterator.testcase.before)
-                testf.write(modified)
-                testf.write(iterator.testcase.after)
+            Path(iterator.testcase.filename).write_bytes(
+                b"".join((iterator.testcase.before, modified, iterator.testcase.after))
+            )
 
             # Re-parse the modified testcase
             new_tc = iterator.testcase.copy()
             new_tc.load(iterator.testcase.filename)
 
             yield from iterator.try_testcase(new_tc, "Collapse empty braces")
+
+
+class ProbMinimize(Strategy):
+    """Probabilistic delta debugging (ProbDD)
+
+    Rather than bisecting with fixed chunk sizes, keep an estimate of the probability
+    that each part is required to keep the testcase interesting. Each attempt removes
+    the set of least likely parts which maximizes the expected number of parts
+    removed. When an attempt fails, the probabilities of the parts it tried to remove
+    are raised accordingly. Reduction ends when every remaining part is known to be
+    required.
+
+    See: Wang et al., "Probabilistic Delta Debugging", ESEC/FSE 2021."""
+
+    name = "minimize-prob"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.init_probability = 0.1
+
+    def add_args(self, parser: argparse.ArgumentParser) -> None:
+        super().add_args(parser)
+        grp_add = parser.add_argument_group(
+            description=f"Additional options for the {self.name} strategy"
+        )
+        grp_add.add_argument(
+            "--init-probability",
+            type=float,
+            default=0.1,
+            help="Initial probability that any part is required. default: 0.1",
+        )
+
+    def process_args(
+        self, parser: argparse.ArgumentParser, args: argparse.Namespace
+    ) -> None:
+        super().process_args(parser, args)
+        self.init_probability = args.init_probability
+        if not 0.0 < self.init_probability < 1.0:
+            parser.error("Initial probability must be between 0 and 1 (exclusive).")
+
+    @staticmethod
+    def _select(probs: list[float]) -> list[int]:
+        """Choose which parts to try removing next.
+
+        Args:
+            probs: Probability that each part is required.
+
+        Returns:
+            Indices into `probs` which maximize the expected number of parts removed,
+            or an empty list if every part is known to be required.
+        """
+        order = sorted(
+            (idx for idx, prob in enumerate(probs) if prob < 1.0),
+            key=probs.__getitem__,
+        )
+        best_gain = 0.0
+        keep_prob = 1.0
+        count = 0
+        for idx in order:
+            # expected gain of removing the first `n` candidates is
+            # n * P(none of them are required)
+            gain = (count + 1) * keep_prob * (1.0 - probs[idx])
+            if gain <= best_gain:
+                break
+            best_gain = gain
+            keep_prob *= 1.0 - probs[idx]
+            count += 1
+        return order[:count]
+
+    @staticmethod
+    def _update_failed(probs: list[float], selected: list[int]) -> None:
+        """Update probabilities after removing `selected` made the testcase
+        uninteresting (at least one of them is required).
+
+        Args:
+            probs: Probability that each part is required (updated in place).
+            selected: Indices into `probs` which were removed in the failed attempt.
+        """
+        if len(selected) == 1:
+            # avoid rounding error, the part is definitely required
+            probs[selected[0]] = 1.0
+            return
+        # P(at least one selected part is required) = 1 - prod(1 - p). computed via
+        # log1p/expm1, since the product rounds to 1.0 for tiny probabilities
+        any_required = -math.expm1(
+            math.fsum(math.log1p(-probs[idx]) for idx in selected)
+        )
+        for idx in selected:
+            probs[idx] = min(probs[idx] / any_required, 1.0)
+
+    # pylint: disable=arguments-renamed
+    @ReductionIterator.wrap  # type: ignore[arg-type]
+    def reduce(  # type: ignore[override]
+        self, iterator: ReductionIterator
+    ) -> Iterator[Testcase]:
+        probs = [self.init_probability] * len(iterator.testcase)
+
+        while True:
+            selected = self._select(probs)
+            if not selected:
+                break
+
+            # map the selected reducible parts to indices into `parts` once, and drop
+            # them all in a single pass (calling `rmslice` per part is quadratic)
+            parts_idx = list(
+                itertools.compress(
+                    range(len(iterator.testcase.parts)), iterator.testcase.reducible
+                )
+            )
+            drop = {parts_idx[idx] for idx in selected}
+            test_to_try = iterator.testcase.copy()
+            test_to_try.parts = [
+                part
+                for idx, part in enumerate(iterator.testcase.parts)
+                if idx not in drop
+            ]
+            test_to_try.reducible = [
+                reducible
+                for idx, reducible in enumerate(iterator.testcase.reducible)
+                if idx not in drop
+            ]
+            status = (
+                f"Removing {quantity(len(selected), iterator.testcase.atom)}"
+                f" of {len(iterator.testcase)}"
+            )
+            success = False
+            # an attempt already tried must have failed: any success is a superset
+            # of the current testcase, and every attempt is a strict subset of it
+            for test in iterator.try_testcase(test_to_try, status):
+                yield test
+                success = iterator.last_feedback
+
+            if success:
+                removed = set(selected)
+                probs = [prob for idx, prob in enumerate(probs) if idx not in removed]
+            else:
+                self._update_failed(probs, selected)
+
+        LOG.info(
+            "Lithium result: succeeded, reduced to: %s",
+            quantity(len(iterator.testcase), iterator.testcase.atom),
+        )
@@ -9,6 +9,8 @@ from __future__ import annotations
 
 import abc
 import argparse
+import functools
+import itertools
 import logging
 import os.path
 import re
@@ -19,6 +21,10 @@ from .util import LithiumError
 
 DEFAULT = "line"
 LOG = logging.getLogger(__name__)
+# line boundaries recognized by `str.splitlines()`
+LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+# match up to and including the last line boundary
+LAST_LINE_BREAK = re.compile(r"(?s:.*)(?:\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029])")
 
 
 class Testcase(abc.ABC):
@@ -65,10 +71,19 @@ class Testcase(abc.ABC):
         start = _clamp(start, 0)
         stop = _clamp(stop, len_self)
 
-        opts = [i for i in range(len(self.parts)) if self.reducible[i]]
-        opts = [0] + opts[1:] + [len(self.parts)]
+        # indices of the reducible parts, selected in C rather than a Python loop
+        opts = list(itertools.compress(range(len(self.parts)), self.reducible))
 
-        return opts[start], opts[stop]
+        def _xlat(bound: int) -> int:
+            # the first and last bounds extend over any leading/trailing
+            # non-reducible parts
+            if bound == 0:
+                return 0
+            if bound == len_self:
+                return len(self.parts)
+            return opts[bound]
+
+        return _xlat(start), _xlat(stop)
 
     def rmslice(self, start: int, stop: int) -> None:
         """Remove a slice of the testcase between `self.parts[start:stop]`, preserving
@@ -113,6 +128,25 @@ class Testcase(abc.ABC):
         Args:
             path: Location on disk of testcase to read.
 
+        Raises:
+            LithiumError: DDBEGIN/DDEND token mismatch.
+        """
+        with open(path, "rb") as fileobj:
+            data = fileobj.read()
+        self.load_bytes(data, path)
+
+    def load_bytes(self, data: bytes, path: Path | str) -> None:
+        """Split a testcase already read into memory.
+
+        `load()` reads the file and calls this. Post-processing done by subclasses
+        which override `load()` is skipped when calling this directly, so code
+        handling any testcase type (eg. from the `lithium_testcases` entry point)
+        should use `load()`.
+
+        Args:
+            data: Contents of the testcase.
+            path: Location on disk the testcase will be written to by `dump()`.
+
         Raises:
             LithiumError: DDBEGIN/DDEND token mismatch.
         """
@@ -121,46 +155,41 @@ class Testcase(abc.ABC):
         self.filename = str(path)
         self.extension = os.path.splitext(self.filename)[1]
 
-        with open(self.filename, "rb") as fileobj:
-            text = fileobj.read().decode("utf-8", errors="surrogateescape")
-
-            lines = [
-                line.encode("utf-8", errors="surrogateescape")
-                for line in text.splitlines(keepends=True)
-            ]
-
-        before = []
-        while lines:
-            line = lines.pop(0)
-            before.append(line)
-            if line.find(b"DDBEGIN") != -1:
-                self.before = b"".join(before)
-                del before
-                break
-            if line.find(b"DDEND") != -1:
-                raise LithiumError(
-                    f"The testcase ({self.filename}) has a line containing 'DDEND' "
-                    "without a line containing 'DDBEGIN' before it."
-                )
-        else:
-            # no DDBEGIN/END, `before` contains the whole testcase
-            self.split_parts(b"".join(before))
-            return
+        text = data.decode("utf-8", errors="surrogateescape")
 
-        between = []
-        while lines:
-            line = lines.pop(0)
-            if line.find(b"DDEND") != -1:
-                self.after = line + b"".join(lines)
-                break
+        # DDBEGIN/DDEND apply to the whole line they appear on (as split by
+        # `str.splitlines()`), and DDBEGIN takes precedence on a line with both
+        begin = text.find("DDBEGIN")
+        end = text.find("DDEND")
+        if end != -1 and (
+            begin == -1 or (end < begin and LINE_BREAK.search(text, end, begin))
+        ):
+            raise LithiumError(
+                f"The testcase ({self.filename}) has a line containing 'DDEND' "
+                "without a line containing 'DDBEGIN' before it."
+            )
+
+        if begin == -1:
+            # no DDBEGIN/END, split the whole testcase
+            self.split_parts(data)
+            return
 
-            between.append(line)
-        else:
+        match = LINE_BREAK.search(text, begin)
+        body_start = len(text) if match is None else match.end(0)
+        end = text.find("DDEND", body_start)
+        if end == -1:
             raise LithiumError(
                 f"The testcase ({self.filename}) has a line containing 'DDBEGIN' but no"
                 "line containing 'DDEND'."
             )
-        self.split_parts(b"".join(between))
+        match = LAST_LINE_BREAK.match(text, body_start, end)
+        body_end = body_start if match is None else match.end(0)
+
+        self.before = text[:body_start].encode("utf-8", errors="surrogateescape")
+        self.after = text[body_end:].encode("utf-8", errors="surrogateescape")
+        self.split_parts(
+            text[body_start:body_end].encode("utf-8", errors="surrogateescape")
+        )
 
     @staticmethod
     def add_arguments(parser: argparse.ArgumentParser) -> None:
@@ -195,12 +224,8 @@ class Testcase(abc.ABC):
         if path is None:
             assert self.filename is not None
             path = self.filename
-        else:
-            path = str(path)
-        with open(path, "wb") as fileobj:
-            fileobj.write(self.before)
-            fileobj.writelines(self.parts)
-            fileobj.write(self.after)
+        # join first so the testcase is written with a single write() call
+        Path(path).write_bytes(b"".join((self.before, *self.parts, self.after)))
 
 
 class TestcaseLine(Testcase):
@@ -234,8 +259,8 @@ class TestcaseChar(Testcase):
     args = ("-c", "--char")
     arg_help = "Treat the file as a sequence of bytes."
 
-    def load(self, path: Path | str) -> None:
-        super().load(path)
+    def load_bytes(self, data: bytes, path: Path | str) -> None:
+        super().load_bytes(data, path)
         if (self.before or self.after) and self.parts:
             # Move the line break at the end of the last line out of the reducible
             # part so the "DDEND" line doesn't get combined with another line.
@@ -263,6 +288,10 @@ class TestcaseJsStr(Testcase):
     arg_help = (
         "Same as --char but only operate within JS strings, keeping escapes intact."
     )
+    CHAR_PATTERN = re.compile(
+        rb"(\\u[0-9A-Fa-f]{4}|\\x[0-9A-Fa-f]{2}|\\u\{[0-9A-Fa-f]+\}|\\.|.)", re.DOTALL
+    )
+    QUOTE_PATTERN = re.compile(rb"""['"]""")
 
     def split_parts(self, data: bytes) -> None:
         instr = None
@@ -271,13 +300,10 @@ class TestcaseJsStr(Testcase):
         while True:
             last = 0
             while True:
+                # match from `last` in place rather than slicing `data[last:]`,
+                # which would copy the remaining input for every token
                 if instr:
-                    match = re.match(
-                        rb"(\\u[0-9A-Fa-f]{4}|\\x[0-9A-Fa-f]{2}|"
-                        rb"\\u\{[0-9A-Fa-f]+\}|\\.|.)",
-                        data[last:],
-                        re.DOTALL,
-                    )
+                    match = self.CHAR_PATTERN.match(data, last)
                     if not match:
                         break
                     chars.append(len(self.parts))
@@ -285,12 +311,12 @@ class TestcaseJsStr(Testcase):
                         instr = None
                         chars.pop()
                 else:
-                    match = re.search(rb"""['"]""", data[last:])
+                    match = self.QUOTE_PATTERN.search(data, last)
                     if not match:
                         break
                     instr = match.group(0)
-                self.parts.append(data[last : last + match.end(0)])
-                last += match.end(0)
+                self.parts.append(data[last : match.end(0)])
+                last = match.end(0)
 
             if last != len(data):
                 self.parts.append(data[last:])
@@ -351,6 +377,26 @@ class TestcaseJsStr(Testcase):
             self.reducible[idx] = True
 
 
+@functools.lru_cache(maxsize=None)
+def _symbol_cutter(before: bytes, after: bytes) -> Pattern[bytes]:
+    # every TestcaseSymbol (including each copy made during reduction) needs the
+    # cutter, so compile each combination of delimiters only once
+    return re.compile(
+        b"["
+        + before
+        + b"]?"
+        + b"[^"
+        + before
+        + after
+        + b"]*"
+        + b"(?:["
+        + after
+        + b"]|$|(?=["
+        + before
+        + b"]))"
+    )
+
+
 class TestcaseSymbol(Testcase):
     """Testcase type for splitting a file before/after a set of delimiters."""
 
@@ -376,20 +422,7 @@ class TestcaseSymbol(Testcase):
             before: Split file before these delimiters.
             after: Split file after these delimiters.
         """
-        self._cutter = re.compile(
-            b"["
-            + before
-            + b"]?"
-            + b"[^"
-            + before
-            + after
-            + b"]*"
-            + b"(?:["
-            + after
-            + b"]|$|(?=["
-            + before
-            + b"]))"
-        )
+        self._cutter = _symbol_cutter(before, after)
 
     def split_parts(self, data: bytes) -> None:
         assert self._cutter is not None
@@ -424,26 +457,34 @@ class TestcaseAttrs(Testcase):
     atom = "attribute"
     args = ("-a", "--attrs")
     arg_help = "Delimit a file by XML attributes."
-    TAG_PATTERN = rb"<\s*[A-Za-z][A-Za-z-]*"
-    ATTR_PATTERN = rb"((\s+|^)[A-Za-z][A-Za-z0-9:-]*(=|>|\s)|\s*>)"
+    TAG_PATTERN = re.compile(rb"<\s*[A-Za-z][A-Za-z-]*")
+    ATTR_PATTERN = re.compile(
+        rb"((\s+|^)[A-Za-z][A-Za-z0-9:-]*(=|>|\s)|\s*>)", re.MULTILINE
+    )
+    # `ATTR_PATTERN` anchored at the scan position: `^` does not match at `pos`
+    # when matching part way through the data, so accept no leading space instead
+    ATTR_START_PATTERN = re.compile(rb"(\s*[A-Za-z][A-Za-z0-9:-]*(=|>|\s)|\s*>)")
+    VALUE_END_PATTERN = re.compile(rb"(\s|>)")
 
     def split_parts(self, data: bytes) -> None:
+        # scan `data` in place from `pos`, rather than slicing off each token
+        pos = 0
         in_tag = False
-        while data:
+        while pos < len(data):
             if in_tag:
                 # we're in what looks like an element definition `<tag ...`
                 # look for attributes, or the end `>`
-                match = re.match(self.ATTR_PATTERN, data)
+                match = self.ATTR_START_PATTERN.match(data, pos)
 
                 if match is None:
                     # before bailing out of the tag, try consuming up to the next space
                     # and resuming the search
-                    match = re.search(self.ATTR_PATTERN, data, flags=re.MULTILINE)
+                    match = self.ATTR_PATTERN.search(data, pos)
                     if match is not None and match.group(0).strip() != b">":
                         LOG.debug("skipping unrecognized data (%r)", match)
-                        self.parts.append(data[: match.start(0)])
+                        self.parts.append(data[pos : match.start(0)])
                         self.reducible.append(False)
-                        data = data[match.start(0) :]
+                        pos = match.start(0)
                         continue
 
                 if match is None or match.group(0).strip() == b">":
@@ -451,12 +492,12 @@ class TestcaseAttrs(Testcase):
                     LOG.debug(
                         "no attribute found (%r) in %r..., looking for other tags",
                         match,
-                        data[:20],
+                        data[pos : pos + 20],
                     )
                     if match is not None:
-                        self.parts.append(data[: match.end(0)])
+                        self.parts.append(data[pos : match.end(0)])
                         self.reducible.append(False)
-                        data = data[match.end(0) :]
+                        pos = match.end(0)
                     continue
 
                 # got an attribute
@@ -467,46 +508,41 @@ class TestcaseAttrs(Testcase):
                     # `\s` or `>` that occurred after the attribute. we need to match
                     # that for the next attribute / element end
                     LOG.debug("value-less attribute")
-                    self.parts.append(data[: match.end(0) - 1])
+                    self.parts.append(data[pos : match.end(0) - 1])
                     self.reducible.append(True)
-                    data = data[match.end(0) - 1 :]
+                    pos = match.end(0) - 1
                     continue
                 # attribute has a value, need to find it's end
-                attr_parts = [match.group(0)]
-                data = data[match.end(0) :]
-                if data[0:1] in {b"'", b'"'}:
+                start = pos
+                value = match.end(0)
+                quote = data[value : value + 1]
+                if quote in {b"'", b'"'}:
                     # quote delimited string value, look for the end quote
-                    attr_parts.append(data[0:1])
-                    data = data[1:]
-                    end_match = re.search(attr_parts[-1], data)
-                    incl_end = True
+                    end = data.find(quote, value + 1)
+                    if end != -1:
+                        end += 1
                 else:
-                    end_match = re.search(rb"(\s|>)", data)
-                    incl_end = False
-                if end_match is None:
+                    end_match = self.VALUE_END_PATTERN.search(data, value)
+                    end = -1 if end_match is None else end_match.start(0)
+                if end == -1:
                     # EOF looking for end quote
-                    data = b"".join(attr_parts) + data
                     LOG.debug("EOF looking for attr end quote")
                     in_tag = False
                     continue
-                end = end_match.end(0)
-                if not incl_end:
-                    end -= 1
-                attr_parts.append(data[:end])
-                data = data[end:]
-                self.parts.append(b"".join(attr_parts))
+                pos = end
+                self.parts.append(data[start:pos])
                 self.reducible.append(True)
                 LOG.debug("found attribute: %r", self.parts[-1])
             else:
-                match = re.search(self.TAG_PATTERN, data)
+                match = self.TAG_PATTERN.search(data, pos)
                 if match is None:
                     break
                 LOG.debug("entering tag: %s", match.group(0))
                 in_tag = True
-                self.parts.append(data[: match.end(0)])
+                self.parts.append(data[pos : match.end(0)])
                 self.reducible.append(False)
-                data = data[match.end(0) :]
-        if data:
+                pos = match.end(0)
+        if pos < len(data):
             LOG.debug("remaining data: %s", match and match.group(0))
-            self.parts.append(data)
+            self.parts.append(data[pos:])
             self.reducible.append(False)
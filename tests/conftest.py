@@ -4,7 +4,11 @@
 """lithium unittest fixtures"""
 
 import argparse
-import os
+import logging
+import platform
+import random
+import shutil
+import subprocess
 from collections.abc import Iterator
 from pathlib import Path
 
@@ -12,6 +16,39 @@ import pytest
 
 import lithium
 
+LOG = logging.getLogger(__name__)
+EXAMPLES_PATH = Path(__file__).parent.parent / "src" / "lithium" / "docs" / "examples"
+IS_WINDOWS = platform.system() == "Windows"
+RNG_SEED = 0xDEADBEEF
+TESTCASE_TYPES = (
+    lithium.testcases.TestcaseChar,
+    lithium.testcases.TestcaseLine,
+    lithium.testcases.TestcaseSymbol,
+)
+
+
+class LastDump:
+    """Contents of the most recent `Testcase.dump()`"""
+
+    def __init__(self) -> None:
+        self.data: bytes | None = None
+
+    def read(self, path: Path) -> bytes:
+        """Get the testcase being checked by the interestingness callback.
+
+        Only dumps to the testcase's own filename are recorded. The check of the
+        original testcase (`interesting(testcase, False)`) doesn't write it there, so
+        read `path` from disk if nothing was recorded since the last call.
+
+        Args:
+            path: Testcase on disk.
+
+        Returns:
+            Contents of the testcase.
+        """
+        data, self.data = self.data, None
+        return path.read_bytes() if data is None else data
+
 
 def pytest_addoption(parser: argparse.Namespace) -> None:
     """Add option to only lint and not run tests"""
@@ -36,30 +73,106 @@ def pytest_collection_modifyitems(session, config, items) -> None:
         items[:] = lint_items
 
 
-@pytest.fixture(
-    params=[
-        lithium.testcases.TestcaseChar,
-        lithium.testcases.TestcaseLine,
-        lithium.testcases.TestcaseSymbol,
-    ]
-)
+@pytest.fixture(params=TESTCASE_TYPES, ids=lambda cls: cls.atom)
 def testcase_cls(request):
     """Use char/line/symbol testcase type for a given test"""
     yield request.param
 
 
 @pytest.fixture
-def tmp_cwd(tmp_path: Path) -> Iterator[Path]:
-    """Same as tmp_path, but chdir to the tmp folder too."""
-    orig = os.getcwd()
-    try:
-        os.chdir(str(tmp_path))
-        yield tmp_path
-    finally:
-        os.chdir(orig)
+def tmp_cwd(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Same as tmp_path, but chdir to the tmp folder too.
+
+    Reductions write the testcase for every attempt. To keep that off disk, pass a
+    memory backed --basetemp (eg. `tox -- --basetemp=/dev/shm/lithium-tests`).
+    """
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+@pytest.fixture
+def temp_js(tmp_cwd: Path) -> Path:
+    """Empty temp.js in the test's working directory"""
+    path = tmp_cwd / "temp.js"
+    path.write_bytes(b"")
+    return path
+
+
+@pytest.fixture
+def last_dump(monkeypatch: pytest.MonkeyPatch) -> LastDump:
+    """Keep the last testcase written to its own filename in memory, so the
+    interestingness callbacks don't need to read it back for every reduction attempt.
+    Copies dumped elsewhere (eg. the temp dir) are left alone."""
+    last = LastDump()
+    orig_dump = lithium.testcases.Testcase.dump
+
+    def _dump(self, path=None):
+        if path is not None:
+            orig_dump(self, path)
+            return
+        # same as Testcase.dump(), but keep the joined buffer instead of joining twice
+        assert self.filename is not None
+        data = b"".join((self.before, *self.parts, self.after))
+        Path(self.filename).write_bytes(data)
+        last.data = data
+
+    monkeypatch.setattr(lithium.testcases.Testcase, "dump", _dump)
+    return last
+
+
+@pytest.fixture
+def rng(request: pytest.FixtureRequest) -> random.Random:
+    """Random number generator with a fixed seed.
+
+    The seed is combined with the test id rather than sharing one generator across
+    the session, so the values drawn don't depend on test order or xdist worker.
+    """
+    return random.Random(f"{RNG_SEED:x}:{request.node.nodeid}")
 
 
 @pytest.fixture
 def examples_path() -> Iterator[Path]:
     """Path to the lithium examples folder"""
-    yield Path(__file__).parent.parent / "src" / "lithium" / "docs" / "examples"
+    yield EXAMPLES_PATH
+
+
+@pytest.fixture(scope="session")
+def crash_exe(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Compile `crash.c` once per session using any available C/C++ compiler.
+
+    The test is skipped if no compiler is able to build it.
+    """
+    if IS_WINDOWS:
+        compilers_to_try = ["cl", "clang", "gcc", "cc"]
+    else:
+        compilers_to_try = ["clang", "gcc", "cc"]
+
+    in_path = EXAMPLES_PATH / "crash.c"
+    assert in_path.is_file()
+    out_path = tmp_path_factory.mktemp("crash") / (
+        "crash.exe" if IS_WINDOWS else "crash"
+    )
+    # probe PATH up front rather than paying a failed exec for each missing compiler
+    compilers_to_try = [c for c in compilers_to_try if shutil.which(c)]
+    if not compilers_to_try:
+        pytest.skip("no C compiler found on PATH")
+    for compiler in compilers_to_try:
+        out_param = "/Fe" if compiler == "cl" else "-o"
+        try:
+            out = subprocess.check_output(
+                [compiler, out_param + str(out_path), str(in_path)],
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as exc:
+            # on PATH, but could not be run (eg. dangling symlink, not executable)
+            LOG.debug("%s could not be run: %s", compiler, exc)
+        except subprocess.CalledProcessError as exc:
+            for line in exc.output.splitlines():
+                LOG.debug("%s: %s", compiler, line.decode())
+        else:
+            for line in out.splitlines():
+                LOG.debug("%s: %s", compiler, line.decode())
+            yield out_path
+            return
+    # all of compilers we tried have failed :(
+    pytest.skip("compile 'crash.c' failed")
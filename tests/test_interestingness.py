@@ -4,8 +4,6 @@
 """Lithium interestingness-test tests"""
 
 import logging
-import platform
-import subprocess
 import sys
 import time
 from pathlib import Path
@@ -17,8 +15,10 @@ import lithium
 from lithium.interestingness import outputs
 from lithium.interestingness.timed_run import RunData
 
+# helper commands only need the stdlib, so skip `site` initialization (-S)
 CAT_CMD = [
     sys.executable,
+    "-S",
     "-c",
     (
         "import sys;"
@@ -31,6 +31,7 @@ CAT_CMD = [
 ]
 LS_CMD = [
     sys.executable,
+    "-S",
     "-c",
     (
         "import glob,itertools,os,sys;"
@@ -42,53 +43,15 @@ LS_CMD = [
         "]"
     ),
 ]
-SLEEP_CMD = [sys.executable, "-c", "import sys,time;time.sleep(int(sys.argv[1]))"]
+SLEEP_CMD = [
+    sys.executable,
+    "-S",
+    "-c",
+    "import sys,time;time.sleep(int(sys.argv[1]))",
+]
 LOG = logging.getLogger(__name__)
 # pylint: disable=invalid-name
-pytestmark = pytest.mark.usefixtures("tmp_cwd", "_tempjs")
-
-
-@pytest.fixture
-def _tempjs() -> None:
-    with open("temp.js", "w"):
-        pass
-
-
-def _compile(in_path: Path, out_path: Path) -> None:
-    """Try to compile a source file using any available C/C++ compiler.
-
-    Args:
-        in_path: Source file to compile from
-        out_path: Executable file to compile to
-
-    Raises:
-        RuntimeError: Raises this exception if the compilation fails or if the compiler
-                      cannot be found
-    """
-    if platform.system() == "Windows":
-        compilers_to_try = ["cl", "clang", "gcc", "cc"]
-    else:
-        compilers_to_try = ["clang", "gcc", "cc"]
-
-    assert Path(in_path).is_file()
-    for compiler in compilers_to_try:
-        out_param = "/Fe" if compiler == "cl" else "-o"
-        try:
-            out = subprocess.check_output(
-                [compiler, out_param + str(out_path), str(in_path)],
-                stderr=subprocess.STDOUT,
-            )
-        except OSError:
-            LOG.debug("%s not found", compiler)
-        except subprocess.CalledProcessError as exc:
-            for line in exc.output.splitlines():
-                LOG.debug("%s: %s", compiler, line.decode())
-        else:
-            for line in out.splitlines():
-                LOG.debug("%s: %s", compiler, line.decode())
-            return
-    # all of compilers we tried have failed :(
-    raise RuntimeError("Compile failed")
+pytestmark = pytest.mark.usefixtures("tmp_cwd", "temp_js")
 
 
 def test_crashes_0() -> None:
@@ -115,32 +78,24 @@ def test_crashes_1() -> None:
             "temp.js",
             "crashes",
             "--timeout",
-            "1",
+            "0.5",
         ]
         + SLEEP_CMD
         + ["3"]
     )
     elapsed = time.time() - start_time
     assert result == 1
-    assert elapsed >= 1
+    assert elapsed >= 0.5
     assert lith.test_count == 1
 
 
-def test_crashes_2(examples_path: Path) -> None:
+def test_crashes_2(crash_exe: Path) -> None:
     """crash test for the 'crashes' interestingness test"""
     lith = lithium.Lithium()
 
-    # if a compiler is available, compile a simple crashing test program
-    src = examples_path / "crash.c"
-    exe = Path.cwd().resolve() / (
-        "crash.exe" if platform.system() == "Windows" else "crash"
+    result = lith.main(
+        ["--strategy", "check-only", "crashes", str(crash_exe), "temp.js"]
     )
-    try:
-        _compile(src, exe)
-    except RuntimeError as exc:
-        LOG.warning(exc)
-        pytest.skip("compile 'crash.c' failed")
-    result = lith.main(["--strategy", "check-only", "crashes", str(exe), "temp.js"])
     assert result == 0
     assert lith.test_count == 1
 
@@ -195,9 +150,10 @@ def test_hangs_0() -> None:
     """test for the 'hangs' interestingness test"""
     lith = lithium.Lithium()
 
-    # test that `sleep 3` hangs over 1s
+    # test that `sleep 3` hangs over 0.5s
     result = lith.main(
-        ["--strategy", "check-only", "--testcase", "temp.js", "hangs", "--timeout", "1"]
+        ["--strategy", "check-only", "--testcase", "temp.js"]
+        + ["hangs", "--timeout", "0.5"]
         + SLEEP_CMD
         + ["3"]
     )
@@ -269,7 +225,7 @@ def test_outputs_timeout() -> None:
             "temp.js",
             "outputs",
             "--timeout",
-            "1",
+            "0.5",
             "--search",
             "blah",
         ]
@@ -278,7 +234,7 @@ def test_outputs_timeout() -> None:
     )
     elapsed = time.time() - start_time
     assert result == 1
-    assert elapsed >= 1
+    assert elapsed >= 0.5
     assert lith.test_count == 1
 
 
@@ -296,11 +252,10 @@ def test_outputs_regex() -> None:
     assert lith.test_count == 1
 
 
-def test_repeat_0() -> None:
+def test_repeat_0(temp_js: Path) -> None:
     """test for the 'repeat' interestingness test"""
     lith = lithium.Lithium()
-    with open("temp.js", "w") as tempf:
-        tempf.write("hello")
+    temp_js.write_bytes(b"hello")
 
     # Check for a known string
     result = lith.main(
@@ -313,21 +268,21 @@ def test_repeat_0() -> None:
     assert lith.test_count == 1
 
 
-def test_repeat_1(caplog) -> None:
+def test_repeat_1(caplog, temp_js: Path) -> None:
     """test for the 'repeat' interestingness test"""
     lith = lithium.Lithium()
-    with open("temp.js", "w") as tempf:
-        tempf.write("hello")
+    temp_js.write_bytes(b"hello")
 
     # Look for a non-existent string, so the "repeat" test tries looping the maximum
     # number of iterations (5x)
     caplog.clear()
-    result = lith.main(
-        ["--strategy", "check-only"]
-        + ["repeat", "5", "outputs", "--search", "notfound"]
-        + CAT_CMD
-        + ["temp.js"]
-    )
+    with caplog.at_level(logging.INFO):
+        result = lith.main(
+            ["--strategy", "check-only"]
+            + ["repeat", "5", "outputs", "--search", "notfound"]
+            + CAT_CMD
+            + ["temp.js"]
+        )
     assert result == 1
     assert lith.test_count == 1
 
@@ -343,68 +298,28 @@ def test_repeat_1(caplog) -> None:
     assert found_count == last_count  # We should have identical count outputs
 
 
-def test_repeat_2() -> None:
-    """test for the 'repeat' interestingness test"""
+@pytest.mark.parametrize(
+    "repeat_num, content",
+    [
+        # Lower boundary - check that 0 (just outside [1]) is not found
+        (1, "num0"),
+        # Upper boundary - check that 2 (just outside [1]) is not found
+        (1, "num2"),
+        # Lower boundary - check that 0 (just outside [1,2]) is not found
+        (2, "num0"),
+        # Upper boundary - check that 3 (just outside [1,2]) is not found
+        (2, "num3"),
+    ],
+)
+def test_repeat_boundary(temp_js: Path, repeat_num: int, content: str) -> None:
+    """test that 'repeat' replaces REPEATNUM only within the repeat range"""
     lith = lithium.Lithium()
+    temp_js.write_text(content)
 
     # Check that replacements on the CLI work properly
-    # Lower boundary - check that 0 (just outside [1]) is not found
-    with open("temp.js", "w") as tempf1a:
-        tempf1a.write("num0")
-    result = lith.main(
-        ["--strategy", "check-only"]
-        + ["repeat", "1", "outputs", "--timeout=9", "--search", "numREPEATNUM"]
-        + CAT_CMD
-        + ["temp.js"]
-    )
-    assert result == 1
-    assert lith.test_count == 1
-
-
-def test_repeat_3() -> None:
-    """test for the 'repeat' interestingness test"""
-    lith = lithium.Lithium()
-
-    # Upper boundary - check that 2 (just outside [1]) is not found
-    with open("temp.js", "w") as tempf1b:
-        tempf1b.write("num2")
     result = lith.main(
         ["--strategy", "check-only"]
-        + ["repeat", "1", "outputs", "--timeout=9", "--search", "numREPEATNUM"]
-        + CAT_CMD
-        + ["temp.js"]
-    )
-    assert result == 1
-    assert lith.test_count == 1
-
-
-def test_repeat_4() -> None:
-    """test for the 'repeat' interestingness test"""
-    lith = lithium.Lithium()
-
-    # Lower boundary - check that 0 (just outside [1,2]) is not found
-    with open("temp.js", "w") as tempf2a:
-        tempf2a.write("num0")
-    result = lith.main(
-        ["--strategy", "check-only"]
-        + ["repeat", "2", "outputs", "--timeout=9", "--search", "numREPEATNUM"]
-        + CAT_CMD
-        + ["temp.js"]
-    )
-    assert result == 1
-    assert lith.test_count == 1
-
-
-def test_repeat_5() -> None:
-    """test for the 'repeat' interestingness test"""
-    lith = lithium.Lithium()
-
-    # Upper boundary - check that 3 (just outside [1,2]) is not found
-    with open("temp.js", "w") as tempf2b:
-        tempf2b.write("num3")
-    result = lith.main(
-        ["--strategy", "check-only"]
-        + ["repeat", "2", "outputs", "--timeout=9", "--search", "numREPEATNUM"]
+        + ["repeat", str(repeat_num), "outputs", "--search", "numREPEATNUM"]
         + CAT_CMD
         + ["temp.js"]
     )
@@ -424,12 +339,12 @@ def test_repeat_5() -> None:
         ("line B", "line B"),
     ],
 )
-def test_interestingness_outputs_multiline(capsys, pattern, expected) -> None:
+def test_interestingness_outputs_multiline(
+    capsys, temp_js: Path, pattern, expected
+) -> None:
     """Tests for the 'outputs' interestingness test with multiline pattern"""
     lith = lithium.Lithium()
-
-    with open("temp.js", "wb") as tmp_f:
-        tmp_f.write(b"line A\nline B\nline C\nline D\nline E\n")
+    temp_js.write_bytes(b"line A\nline B\nline C\nline D\nline E\n")
 
     capsys.readouterr()  # clear captured output buffers
     result = lith.main(
@@ -441,7 +356,7 @@ def test_interestingness_outputs_multiline(capsys, pattern, expected) -> None:
         + CAT_CMD
         + ["temp.js"]
     )
-    assert result == 0, f"{pattern!r} not found in {Path('temp.js').read_text()!r}"
+    assert result == 0, f"{pattern!r} not found in {temp_js.read_text()!r}"
     #    assert lith.test_count == 1
     captured = capsys.readouterr()
     assert f"[Found string in: {expected!r}]" in captured.out
@@ -24,8 +24,7 @@ def test_executable() -> None:
 def test_class() -> None:
     """test that lithium works as a class"""
     lith = lithium.Lithium()
-    with open("empty.txt", "w"):
-        pass
+    Path("empty.txt").write_bytes(b"")
 
     class _Interesting:
         # pylint: disable=missing-function-docstring
@@ -58,8 +57,7 @@ def test_class() -> None:
 def test_empty(caplog) -> None:
     """test lithium with empty input"""
     lith = lithium.Lithium()
-    with open("empty.txt", "w"):
-        pass
+    Path("empty.txt").write_bytes(b"")
 
     class _Interesting:
         # pylint: disable=missing-function-docstring
@@ -77,16 +75,13 @@ def test_empty(caplog) -> None:
     lith.testcase = lithium.testcases.TestcaseLine()
     lith.testcase.load("empty.txt")
     caplog.clear()
-    assert lith.run() == 0
-    for record in caplog.records:
-        if record.name == "lithium.strategies" and record.levelno == logging.INFO:
-            if (
-                "The file has 0 lines so there's nothing for Lithium to try to remove!"
-                in record.getMessage()
-            ):
-                break
-    else:
-        raise RuntimeError("Missing log output")
+    with caplog.at_level(logging.INFO, logger="lithium"):
+        assert lith.run() == 0
+    assert (
+        "lithium.strategies",
+        logging.INFO,
+        "The file has 0 lines so there's nothing for Lithium to try to remove!",
+    ) in caplog.record_tuples
 
 
 @pytest.mark.parametrize("char", [(True, False)])
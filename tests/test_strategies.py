@@ -3,17 +3,26 @@
 # file, You can obtain one at https://mozilla.org/MPL/2.0/.
 """Lithium Strategy tests"""
 
+import argparse
+import time
 from pathlib import Path
 
 import pytest
 
 import lithium
 
+# every byte value except brackets
+NOT_BRACKETS = bytes(c for c in range(256) if c not in b"{}()[]")
 pytestmark = pytest.mark.usefixtures("tmp_cwd")  # pylint: disable=invalid-name
 
 
-def test_minimize(testcase_cls) -> None:
-    """test that minimize strategy works"""
+@pytest.mark.parametrize(
+    "strategy_cls",
+    [lithium.strategies.Minimize, lithium.strategies.ProbMinimize],
+    ids=lambda cls: cls.name,
+)
+def test_minimize(last_dump, testcase_cls, strategy_cls) -> None:
+    """test that minimize strategies work"""
     test_path = Path("a.txt")
 
     class _Interesting:
@@ -22,14 +31,14 @@ def test_minimize(testcase_cls) -> None:
             pass
 
         def interesting(self, *_):
-            return b"o\n" in test_path.read_bytes()
+            return b"o\n" in last_dump.read(test_path)
 
         def cleanup(self, condition_args):
             pass
 
     obj = lithium.Lithium()
     obj.condition_script = _Interesting()
-    obj.strategy = lithium.strategies.Minimize()
+    obj.strategy = strategy_cls()
     test_path.write_bytes(b"x\n\nx\nx\no\nx\nx\nx\n")
     obj.testcase = testcase_cls()
     obj.testcase.load(test_path)
@@ -37,7 +46,7 @@ def test_minimize(testcase_cls) -> None:
     assert test_path.read_bytes() == b"o\n"
 
 
-def test_minimize_around(testcase_cls) -> None:
+def test_minimize_around(last_dump, testcase_cls) -> None:
     """test that minimize around strategy works"""
     test_path = Path("a.txt")
 
@@ -47,8 +56,11 @@ def test_minimize_around(testcase_cls) -> None:
             pass
 
         def interesting(self, *_):
-            data = test_path.read_bytes()
-            return b"o\n" in data and len(set(data.split(b"o\n"))) == 1
+            data = last_dump.read(test_path)
+            idx = data.find(b"o\n")
+            if idx == -1 or data.find(b"o\n", idx + 2) != -1:
+                return False
+            return data[:idx] == data[idx + 2 :]
 
         def cleanup(self, condition_args):
             pass
@@ -63,7 +75,7 @@ def test_minimize_around(testcase_cls) -> None:
     assert test_path.read_bytes() == b"o\n"
 
 
-def test_minimize_balanced(testcase_cls) -> None:
+def test_minimize_balanced(last_dump, testcase_cls) -> None:
     """test that minimize balanced strategy works"""
     test_path = Path("a.txt")
 
@@ -73,9 +85,12 @@ def test_minimize_balanced(testcase_cls) -> None:
             pass
 
         def interesting(self, *_):
-            data = test_path.read_bytes()
-            if b"o\n" in data:
-                head, tail = data.split(b"o\n")
+            data = last_dump.read(test_path)
+            idx = data.find(b"o\n")
+            if idx != -1 and data.find(b"o\n", idx + 2) == -1:
+                # strip everything but brackets in a single pass before counting
+                head = data[:idx].translate(None, NOT_BRACKETS)
+                tail = data[idx + 2 :].translate(None, NOT_BRACKETS)
                 return (
                     (head.count(b"{") == tail.count(b"}"))
                     and (head.count(b"(") == tail.count(b")"))
@@ -96,7 +111,7 @@ def test_minimize_balanced(testcase_cls) -> None:
     assert test_path.read_bytes() == b"o\n"
 
 
-def test_replace_properties(testcase_cls) -> None:
+def test_replace_properties(last_dump, testcase_cls) -> None:
     """test that replace properties strategy works"""
     original = (
         # original: this.list, prototype.push, prototype.last
@@ -146,7 +161,7 @@ def test_replace_properties(testcase_cls) -> None:
             pass
 
         def interesting(self, *_):
-            return test_path.read_bytes() in valid_reductions
+            return last_dump.read(test_path) in valid_reductions
 
         def cleanup(self, condition_args):
             pass
@@ -167,7 +182,7 @@ def test_replace_properties(testcase_cls) -> None:
         assert data == expected
 
 
-def test_replace_arguments(testcase_cls) -> None:
+def test_replace_arguments(last_dump, testcase_cls) -> None:
     """test that replace arguments strategy works"""
     original = b"function foo(a,b) {\n  list = a + b;\n}\nfoo(2,3)\n"
     expected = b"function foo() {\n  list = a + b;\n}\na = 2;\nb = 3;\nfoo()\n"
@@ -187,7 +202,7 @@ def test_replace_arguments(testcase_cls) -> None:
             pass
 
         def interesting(self, *_):
-            return test_path.read_bytes() in valid_reductions
+            return last_dump.read(test_path) in valid_reductions
 
         def cleanup(self, condition_args) -> None:
             pass
@@ -215,7 +230,7 @@ def test_replace_arguments(testcase_cls) -> None:
         ("NO_BRACE", 13, b"o\n"),
     ],
 )
-def test_minimize_collapse_braces(test_type, test_count, expected) -> None:
+def test_minimize_collapse_braces(last_dump, test_type, test_count, expected) -> None:
     """test that collapse-braces strategy eliminates empty braces"""
     test_path = Path("a.txt")
 
@@ -225,13 +240,15 @@ def test_minimize_collapse_braces(test_type, test_count, expected) -> None:
             pass
 
         def interesting(self, condition_args, *_):
-            data = test_path.read_bytes()
+            data = last_dump.read(test_path)
+            # counting is then done over the brackets only, not the whole testcase
+            brackets = data.translate(None, NOT_BRACKETS)
             if condition_args == "NEEDS_BRACE":
-                return data.count(b"{") == 1 and data.count(b"{") == data.count(b"}")
+                return brackets.count(b"{") == 1 and brackets.count(b"}") == 1
 
             if condition_args == "NO_BRACE":
                 if b"o\n" in data:
-                    return data.count(b"{") == data.count(b"}")
+                    return brackets.count(b"{") == brackets.count(b"}")
 
             return False
 
@@ -251,7 +268,12 @@ def test_minimize_collapse_braces(test_type, test_count, expected) -> None:
     assert obj.test_count == test_count
 
 
-def test_minimize_reducible() -> None:
+@pytest.mark.parametrize(
+    "strategy_cls",
+    [lithium.strategies.Minimize, lithium.strategies.ProbMinimize],
+    ids=lambda cls: cls.name,
+)
+def test_minimize_reducible(last_dump, strategy_cls) -> None:
     """test that minimize works around non-reducible parts in the testcase"""
     test_path = Path("a.txt")
 
@@ -261,14 +283,14 @@ def test_minimize_reducible() -> None:
             pass
 
         def interesting(self, *_):
-            return b"o\n" in test_path.read_bytes()
+            return b"o\n" in last_dump.read(test_path)
 
         def cleanup(self, condition_args) -> None:
             pass
 
     obj = lithium.Lithium()
     obj.condition_script = _Interesting()
-    obj.strategy = lithium.strategies.Minimize()
+    obj.strategy = strategy_cls()
     test_path.write_bytes(b"x\n\nx\nx\no\nx\nx\nx\n")
     obj.testcase = lithium.testcases.TestcaseLine()
     obj.testcase.load(test_path)
@@ -282,3 +304,109 @@ def test_minimize_reducible() -> None:
     obj.testcase.reducible[-1] = False
     assert obj.run() == 0
     assert test_path.read_bytes() == b"o\nx\n"
+
+
+def test_prob_minimize_select() -> None:
+    """test that minimize-prob picks the removal with the best expected gain"""
+    # pylint: disable=protected-access
+    select = lithium.strategies.ProbMinimize._select
+    # nothing left to try once every part is known to be required
+    assert select([]) == []
+    assert select([1.0, 1.0]) == []
+    # gain of removing n parts with p=0.1 is n * 0.9**n, which peaks at n=9
+    assert select([0.1] * 20) == list(range(9))
+    # the least likely parts are tried first, and required parts are skipped
+    assert select([0.9, 1.0, 0.2, 0.3]) == [2, 3]
+    # a single remaining candidate is tried alone
+    assert select([1.0, 0.6, 1.0]) == [1]
+
+
+def test_prob_minimize_update_failed() -> None:
+    """test probability updates after a failed minimize-prob attempt"""
+    # pylint: disable=protected-access
+    update = lithium.strategies.ProbMinimize._update_failed
+    # a single part which can't be removed is required
+    probs = [0.1, 0.3]
+    update(probs, [1])
+    assert probs == [0.1, 1.0]
+    # otherwise each part is scaled by 1 / P(at least one was required)
+    probs = [0.5, 0.5, 0.2]
+    update(probs, [0, 1])
+    assert probs == pytest.approx([0.5 / 0.75, 0.5 / 0.75, 0.2])
+    # 1 - p rounds to 1.0 for tiny probabilities, this must not divide by zero
+    probs = [1e-17] * 4
+    update(probs, [0, 1, 2, 3])
+    assert probs == pytest.approx([0.25] * 4)
+
+
+@pytest.mark.parametrize("value", ["0", "1", "-0.5", "1.5"])
+def test_prob_minimize_init_probability_invalid(value: str) -> None:
+    """test that minimize-prob rejects initial probabilities outside (0, 1)"""
+    strategy = lithium.strategies.ProbMinimize()
+    parser = argparse.ArgumentParser()
+    strategy.add_args(parser)
+    args = parser.parse_args(["--init-probability", value])
+    with pytest.raises(SystemExit):
+        strategy.process_args(parser, args)
+
+
+@pytest.mark.parametrize("value", ["0.5", "1e-17"])
+def test_prob_minimize_init_probability(last_dump, value: str) -> None:
+    """test that minimize-prob reduces with any valid initial probability"""
+    test_path = Path("a.txt")
+
+    class _Interesting:
+        # pylint: disable=missing-function-docstring
+        def init(self, condition_args) -> None:
+            pass
+
+        def interesting(self, *_):
+            return b"o\n" in last_dump.read(test_path)
+
+        def cleanup(self, condition_args) -> None:
+            pass
+
+    strategy = lithium.strategies.ProbMinimize()
+    parser = argparse.ArgumentParser()
+    strategy.add_args(parser)
+    strategy.process_args(parser, parser.parse_args(["--init-probability", value]))
+    assert strategy.init_probability == float(value)
+
+    obj = lithium.Lithium()
+    obj.condition_script = _Interesting()
+    obj.strategy = strategy
+    test_path.write_bytes(b"x\no\nx\n")
+    obj.testcase = lithium.testcases.TestcaseLine()
+    obj.testcase.load(test_path)
+    assert obj.run() == 0
+    assert test_path.read_bytes() == b"o\n"
+
+
+def test_prob_minimize_large(last_dump) -> None:
+    """test that minimize-prob stays fast when most parts are selected at once"""
+    test_path = Path("a.txt")
+
+    class _Interesting:
+        # pylint: disable=missing-function-docstring
+        def init(self, condition_args) -> None:
+            pass
+
+        def interesting(self, *_):
+            return b"o\n" in last_dump.read(test_path)
+
+        def cleanup(self, condition_args) -> None:
+            pass
+
+    obj = lithium.Lithium()
+    obj.condition_script = _Interesting()
+    # a tiny initial probability selects nearly every part for each attempt
+    obj.strategy = lithium.strategies.ProbMinimize()
+    obj.strategy.init_probability = 1e-17
+    test_path.write_bytes(b"x\n" * 4000 + b"o\n" + b"x\n" * 4000)
+    obj.testcase = lithium.testcases.TestcaseLine()
+    obj.testcase.load(test_path)
+    start = time.perf_counter()
+    assert obj.run() == 0
+    # a per-part rmslice() would take several seconds here
+    assert time.perf_counter() - start < 2
+    assert test_path.read_bytes() == b"o\n"
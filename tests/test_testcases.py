@@ -35,9 +35,9 @@ def test_line() -> None:
 def test_line_dd() -> None:
     """Test line splitting with DDBEGIN/END"""
     test = lithium.testcases.TestcaseLine()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"pre\n" b"DDBEGIN\n" b"data\n" b"2\n" b"DDEND\n" b"post\n")
-    test.load(test_path)
+    test.load_bytes(
+        b"pre\n" b"DDBEGIN\n" b"data\n" b"2\n" b"DDEND\n" b"post\n", "a.txt"
+    )
     assert test.before == b"pre\nDDBEGIN\n"
     assert test.parts == [b"data\n", b"2\n"]
     assert test.reducible == [True, True]
@@ -45,12 +45,25 @@ def test_line_dd() -> None:
     assert len(test) == 2
 
 
+def test_line_dd_line_breaks() -> None:
+    """Test DDBEGIN/END apply to whole lines, for any line boundary"""
+    test = lithium.testcases.TestcaseLine()
+    test.load_bytes(
+        b"pre\r\n" b"DDBEGIN DDEND\r\n" b"data\x0b" b"2\r" b"x DDEND\r\n" b"post\n",
+        "a.txt",
+    )
+    assert test.before == b"pre\r\nDDBEGIN DDEND\r\n"
+    assert test.parts == [b"data\x0b", b"2\r"]
+    assert test.reducible == [True, True]
+    assert test.after == b"x DDEND\r\npost\n"
+
+
 def test_char_dd() -> None:
     """Test char splitting with DDBEGIN/END"""
     test = lithium.testcases.TestcaseChar()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"pre\n" b"DDBEGIN\n" b"data\n" b"2\n" b"DDEND\n" b"post\n")
-    test.load(test_path)
+    test.load_bytes(
+        b"pre\n" b"DDBEGIN\n" b"data\n" b"2\n" b"DDEND\n" b"post\n", "a.txt"
+    )
     assert test.before == b"pre\nDDBEGIN\n"
     assert test.parts == [b"d", b"a", b"t", b"a", b"\n", b"2"]
     assert test.reducible == [True] * 6
@@ -61,8 +74,7 @@ def test_char_dd() -> None:
 def test_jsstr_0() -> None:
     """Test that the TestcaseJsStr class splits JS strings properly 0"""
     test = lithium.testcases.TestcaseJsStr()
-    test_path = Path("a.txt")
-    test_path.write_bytes(
+    test.load_bytes(
         b"pre\n"
         b"DDBEGIN\n"
         b"data\n"
@@ -73,9 +85,9 @@ def test_jsstr_0() -> None:
         b"Data\xFF\n"
         b'"x\xFF" something\n'  # last str
         b"DDEND\n"
-        b"post\n"
+        b"post\n",
+        "a.txt",
     )
-    test.load(test_path)
     assert test.before == b"pre\nDDBEGIN\ndata\n2\n'"
     assert test.parts == [
         b"\\u{123}",
@@ -104,9 +116,7 @@ def test_jsstr_0() -> None:
 def test_jsstr_1() -> None:
     """Test that the TestcaseJsStr class splits JS strings properly 1"""
     test = lithium.testcases.TestcaseJsStr()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"'xabcx'")
-    test.load(test_path)
+    test.load_bytes(b"'xabcx'", "a.txt")
     assert test.before == b"'"
     assert test.parts == [b"x", b"a", b"b", b"c", b"x"]
     assert len(test) == 5
@@ -117,9 +127,7 @@ def test_jsstr_1() -> None:
 def test_jsstr_2() -> None:
     """Test that the TestcaseJsStr class splits JS strings properly 2"""
     test = lithium.testcases.TestcaseJsStr()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"'x'abcx'")
-    test.load(test_path)
+    test.load_bytes(b"'x'abcx'", "a.txt")
     assert test.before == b"'"
     assert test.parts == [b"x"]
     assert len(test) == 1
@@ -130,9 +138,7 @@ def test_jsstr_2() -> None:
 def test_jsstr_3() -> None:
     """Test that the TestcaseJsStr class splits JS strings properly 3"""
     test = lithium.testcases.TestcaseJsStr()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b'\'x"abc"x')
-    test.load(test_path)
+    test.load_bytes(b'\'x"abc"x', "a.txt")
     assert test.before == b"'x\""
     assert test.parts == [b"a", b"b", b"c"]
     assert len(test) == 3
@@ -143,9 +149,9 @@ def test_jsstr_3() -> None:
 def test_symbol_0() -> None:
     """Test symbol splitting 0"""
     test = lithium.testcases.TestcaseSymbol()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"pre\n" b"DDBEGIN\n" b"d{a}ta\n" b"2\n" b"DDEND\n" b"post\n")
-    test.load(test_path)
+    test.load_bytes(
+        b"pre\n" b"DDBEGIN\n" b"d{a}ta\n" b"2\n" b"DDEND\n" b"post\n", "a.txt"
+    )
     assert test.before == b"pre\nDDBEGIN\n"
     assert test.parts == [b"d{", b"a", b"}ta\n", b"2\n"]
     assert len(test) == 4
@@ -156,11 +162,10 @@ def test_symbol_0() -> None:
 def test_symbol_1() -> None:
     """Test symbol splitting 1"""
     test = lithium.testcases.TestcaseSymbol()
-    test_path = Path("a.txt")
-    test_path.write_bytes(
-        b"pre\n" b"DDBEGIN\n" b"{data\n" b"2}\n}" b"DDEND\n" b"post\n"
+    test.load_bytes(
+        b"pre\n" b"DDBEGIN\n" b"{data\n" b"2}\n}" b"DDEND\n" b"post\n",
+        "a.txt",
     )
-    test.load(test_path)
     assert test.before == b"pre\nDDBEGIN\n"
     assert test.parts == [b"{", b"data\n", b"2", b"}\n"]
     assert test.after == b"}DDEND\npost\n"
@@ -171,9 +176,7 @@ def test_symbol_1() -> None:
 def test_attrs_0() -> None:
     """Test html attr splitting 0"""
     test = lithium.testcases.TestcaseAttrs()
-    test_path = Path("a.txt")
-    test_path.write_bytes(b"<tag some attr=value>")
-    test.load(test_path)
+    test.load_bytes(b"<tag some attr=value>", "a.txt")
     assert test.before == b""
     assert test.after == b""
     assert test.parts == [b"<tag", b" some", b" attr=value", b">"]
@@ -184,14 +187,13 @@ def test_attrs_0() -> None:
 def test_attrs_1() -> None:
     """Test html attr splitting 1"""
     test = lithium.testcases.TestcaseAttrs()
-    test_path = Path("a.txt")
-    test_path.write_bytes(
+    test.load_bytes(
         b"<\n"
         b"tag attr='value\n"
         b'\'> <p color="blue"\n'
-        b' class="123 456" id=some no-term="blah > thing=not\n'
+        b' class="123 456" id=some no-term="blah > thing=not\n',
+        "a.txt",
     )
-    test.load(test_path)
     assert test.before == b""
     assert test.after == b""
     assert test.parts == [
@@ -280,9 +282,7 @@ def test_attrs_2(
     """Test html attr splitting 2"""
     parts_with_bytes = [part.encode("utf-8") for part in parts]
     test = lithium.testcases.TestcaseAttrs()
-    test_path = Path("a.txt")
-    test_path.write_text(data)
-    test.load(test_path)
+    test.load_bytes(data.encode("utf-8"), "a.txt")
     assert test.before == b""
     assert test.after == b""
     assert test.parts == parts_with_bytes
@@ -298,18 +298,17 @@ def test_attrs_2(
         (b"DDBEGIN DDEND\n", "'DDBEGIN' but no"),
         (b"DDEND DDBEGIN\n", "'DDBEGIN' but no"),
         (b"DDBEGIN\n", "'DDBEGIN' but no"),
+        (b"DDEND\nDDBEGIN\nDDEND\n", "'DDEND' without"),
     ],
 )
 def test_errors(data: bytes, error: str) -> None:
     """Test DDBEGIN/END errors"""
     test = lithium.testcases.TestcaseLine()
-    test_path = Path("a.txt")
-    test_path.write_bytes(data)
     with pytest.raises(
         lithium.LithiumError,
-        match=rf"^The testcase \({test_path}\) has a line containing {error}",
+        match=rf"^The testcase \(a.txt\) has a line containing {error}",
     ):
-        test.load(test_path)
+        test.load_bytes(data, "a.txt")
 
 
 def test_reducible_slices() -> None:
@@ -4,19 +4,22 @@
 """Lithium utility tests"""
 
 import logging
-import math
 import random
-import sys
 
 import pytest
 
 import lithium
 
 LOG = logging.getLogger(__name__)
+# integers either side of each power of two up to 2**64, where off-by-one errors show
+BOUNDARY_INTS = sorted(
+    {n for k in range(65) for n in ((1 << k) - 1, 1 << k, (1 << k) + 1) if n >= 1}
+)
+RANDOM_SAMPLES = 1000
 pytestmark = pytest.mark.usefixtures("tmp_cwd")  # pylint: disable=invalid-name
 
 
-def _ispow2(inp: int) -> int:
+def _ispow2(inp: int) -> bool:
     """Simple version of `is_power_of_two` for testing and comparison
 
     Args:
@@ -29,25 +32,7 @@ def _ispow2(inp: int) -> int:
         isinstance(inp, int) or inp.is_integer()
     ), f"ispow2() only works for integers, {inp!r} is not an integer"
     assert inp >= 1, "domain error"
-    orig = inp
-    result = True
-    while inp > 1:
-        if inp % 2:
-            result = False
-            break
-        inp //= 2
-    # if the input is representable as a float, compare the result to math library
-    if orig <= sys.float_info.max:
-        math_result = math.log(orig) / math.log(2)
-        # diff to the next closest integer
-        diff = abs(math_result - round(math_result))
-        math_result = diff < 10 ** -(
-            sys.float_info.dig - 1
-        )  # float_info.dig is the # of decimal digits representable
-        assert (
-            result == math_result
-        ), f"ispow2(n) did not match math.log(n)/math.log(2) for n = {orig}"
-    return result
+    return (inp & (inp - 1)) == 0
 
 
 def _divceil(num: int, den: int) -> int:
@@ -60,79 +45,110 @@ def _divceil(num: int, den: int) -> int:
     Returns:
         result
     """
-    quo = num // den
-    rem = num % den
-    result = quo + (1 if rem else 0)
-    # if the inputs are representable as a float, compare the result to math library
-    if num <= sys.float_info.max and den <= sys.float_info.max:
-        math_result = math.ceil(1.0 * num / den)
-        assert (
-            result == math_result
-        ), f"divceil(n,d) did not match math.ceil(n/d) for n = {num}, d = {den}"
+    # floor division of the negation rounds towards -inf, so negating the result
+    # rounds up (exact for any size of integer, unlike math.ceil of a float)
+    return -(-num // den)
+
+
+def _random_ints(rng: random.Random, count: int, low: int) -> list[int]:
+    """Draw random integers uniformly from `[low, 2**64)`.
+
+    `getrandbits` avoids the range bookkeeping done by `randint` for each sample.
+
+    Args:
+        rng: random number generator to draw from
+        count: number of integers to draw
+        low: smallest acceptable value
+
+    Returns:
+        random integers
+    """
+    result: list[int] = []
+    while len(result) < count:
+        num = rng.getrandbits(64)
+        if num >= low:
+            result.append(num)
     return result
 
 
-def test_divide_rounding_up() -> None:
-    """test `divide_rounding_up`"""
-    for _ in range(10000):
-        num = random.randint(1, (1 << 64) - 1)
-        den = random.randint(1, num)
+def _check_divide_rounding_up(pairs: list[tuple[int, int]]) -> None:
+    """Compare `divide_rounding_up` to `_divceil` for each (num, den) pair"""
+    for num, den in pairs:
         try:
             assert _divceil(num, den) == lithium.util.divide_rounding_up(num, den)
             assert lithium.util.divide_rounding_up(num, num) == 1
             assert lithium.util.divide_rounding_up(0, num) == 0
             assert lithium.util.divide_rounding_up(num + 1, num) == 2
         except Exception:
-            LOG.debug("n = %d, d = %d", num, den)
+            LOG.info("n = %d, d = %d", num, den)
             raise
 
 
-def test_is_power_of_two() -> None:
-    """test `is_power_of_two`"""
-    assert not lithium.util.is_power_of_two(0)
-    # try all integers [1,10000)
-    for i in range(1, 10000):
+def _check_is_power_of_two(inputs: list[int]) -> None:
+    """Compare `is_power_of_two` to `_ispow2` for each input"""
+    for inp in inputs:
         try:
-            assert _ispow2(i) == lithium.util.is_power_of_two(i)
+            assert _ispow2(inp) == lithium.util.is_power_of_two(inp)
         except Exception:
-            LOG.debug("i = %d", i)
+            LOG.info("inp = %d", inp)
             raise
-    # try 10000 random integers >= 10000
-    for _ in range(10000):
-        rand = random.randint(10000, (1 << 64) - 1)
+
+
+def _check_largest_power_of_two_smaller_than(inputs: list[int]) -> None:
+    """Check the bounds on `largest_power_of_two_smaller_than` for each input"""
+    for inp in inputs:
         try:
-            assert _ispow2(rand) == lithium.util.is_power_of_two(rand)
+            result = lithium.util.largest_power_of_two_smaller_than(inp)
+            # check that it is a power of two
+            assert _ispow2(result)
+            # check that it is < i
+            if inp != 1:
+                assert result < inp
+            # check that the next power of 2 is >= i
+            assert result * 2 >= inp
         except Exception:
-            LOG.debug("inp = %d", rand)
+            LOG.info("inp = %d", inp)
             raise
 
 
+def test_divide_rounding_up() -> None:
+    """test `divide_rounding_up` around powers of two"""
+    _check_divide_rounding_up(
+        [
+            (num, den)
+            for num in BOUNDARY_INTS
+            for den in {1, 2, max(num // 2, 1), max(num - 1, 1), num}
+            if den <= num
+        ]
+    )
+
+
+def test_divide_rounding_up_random(rng: random.Random) -> None:
+    """test `divide_rounding_up` with random integers"""
+    _check_divide_rounding_up(
+        [(num, rng.randint(1, num)) for num in _random_ints(rng, RANDOM_SAMPLES, 1)]
+    )
+
+
+def test_is_power_of_two() -> None:
+    """test `is_power_of_two`"""
+    assert not lithium.util.is_power_of_two(0)
+    # try all integers [1,10000), and integers around each power of two
+    _check_is_power_of_two(list(range(1, 10000)) + BOUNDARY_INTS)
+
+
+def test_is_power_of_two_random(rng: random.Random) -> None:
+    """test `is_power_of_two` with random integers >= 10000"""
+    _check_is_power_of_two(_random_ints(rng, RANDOM_SAMPLES, 10000))
+
+
 def test_largest_power_of_two_smaller_than() -> None:
     """test `largest_power_of_two_smaller_than`"""
     assert lithium.util.largest_power_of_two_smaller_than(0) == 1
+    # try all integers [1,10000), and integers around each power of two
+    _check_largest_power_of_two_smaller_than(list(range(1, 10000)) + BOUNDARY_INTS)
 
-    def check_result(inp: int) -> None:
-        result = lithium.util.largest_power_of_two_smaller_than(inp)
-        # check that it is a power of two
-        assert _ispow2(result)
-        # check that it is < i
-        if inp != 1:
-            assert result < inp
-        # check that the next power of 2 is >= i
-        assert result * 2 >= inp
-
-    # try all integers [1,10000)
-    for inp in range(1, 10000):
-        try:
-            check_result(inp)
-        except Exception:
-            LOG.debug("inp = %d", inp)
-            raise
-    # try 10000 random integers >= 10000
-    for _ in range(10000):
-        rand = random.randint(10000, (1 << 64) - 1)
-        try:
-            check_result(rand)
-        except Exception:
-            LOG.debug("inp = %d", rand)
-            raise
+
+def test_largest_power_of_two_smaller_than_random(rng: random.Random) -> None:
+    """test `largest_power_of_two_smaller_than` with random integers >= 10000"""
+    _check_largest_power_of_two_smaller_than(_random_ints(rng, RANDOM_SAMPLES, 10000))